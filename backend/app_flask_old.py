@@ -1,18 +1,124 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, has_request_context, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_cors import CORS
-from datetime import datetime
+from flask_compress import Compress
+from cachetools import TTLCache
+from sqlalchemy import create_engine, event, insert, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import joinedload, make_transient_to_detached
+from sqlalchemy.pool import QueuePool
+from datetime import datetime, timezone
+import hashlib
+import orjson
 import os
+import threading
+import time
+
+def json_dumps(obj):
+    # Timestamps are stored as naive UTC; emit them as ISO 8601 with a "Z".
+    return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+
+def utcnow():
+    return datetime.now(timezone.utc)
+
+class ORJSONProvider(JSONProvider):
+    """Serve jsonify() through orjson, which also encodes datetimes natively."""
+
+    def dumps(self, obj, **kwargs):
+        return json_dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(json_dumps(obj), mimetype="application/json")
 
 app = Flask(__name__, static_folder="static", static_url_path="/static")
+app.json = ORJSONProvider(app)
 CORS(app)
+# Only compress API responses; static assets are left to the server in front.
+app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+app.config["COMPRESS_LEVEL"] = 6
+app.config["COMPRESS_MIN_SIZE"] = 500
+Compress(app)
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 db_path = os.path.join(basedir, "recruitify.db")
 app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + db_path
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+# Behind Apache (mod_xsendfile) or lighttpd, let the server sendfile() static
+# assets instead of Python reading them. nginx ignores X-Sendfile (it uses
+# X-Accel-Redirect). Off by default: without such a server the body is empty.
+app.config["USE_X_SENDFILE"] = os.environ.get("RECRUITIFY_X_SENDFILE") == "1"
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+    "connect_args": {"check_same_thread": False, "timeout": 5},
+    "poolclass": QueuePool,
+    "pool_size": 1,
+    "max_overflow": 0,
+    "pool_pre_ping": True,
+    "pool_recycle": 3600,
+}
+
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "busy_timeout=5000",
+    "cache_size=-20000",
+    "temp_store=memory",
+    "foreign_keys=ON",
+)
+
+# Read-only connections cannot switch the journal mode; the writer does it.
+READ_PRAGMAS = tuple(p for p in SQLITE_PRAGMAS if not p.startswith("journal_mode"))
+
+def sqlite_pragmas(pragmas):
+    def set_sqlite_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+    return set_sqlite_pragmas
+
+# GET requests read through their own pool of read-only connections so they
+# never contend with (or get upgraded into) the single writer connection.
+read_engine = create_engine(
+    "sqlite:///file:" + db_path + "?mode=ro&uri=true",
+    connect_args={"check_same_thread": False, "timeout": 5},
+    poolclass=QueuePool,
+    # SQLite reads mostly wait on I/O, so keep at least 5 connections even on
+    # small hosts and let bursts (and long streamed responses) overflow.
+    pool_size=max(os.cpu_count() or 1, 5),
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+)
+event.listen(read_engine, "connect", sqlite_pragmas(READ_PRAGMAS))
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_request_context() and request.method in ("GET", "HEAD"):
+            return read_engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+# Objects are not expired on commit: everything a handler serializes after
+# commit() was just written or returned by INSERT ... RETURNING, so reloading it
+# with another SELECT would only cost a round-trip.
+db = SQLAlchemy(app, session_options={"class_": RoutingSession, "expire_on_commit": False})
+
+def disable_pysqlite_transactions(dbapi_conn, connection_record):
+    # Let SQLAlchemy emit BEGIN itself instead of pysqlite's deferred BEGIN.
+    dbapi_conn.isolation_level = None
+
+def begin_immediate(conn):
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
 
-db = SQLAlchemy(app)
+with app.app_context():
+    event.listen(db.engine, "connect", sqlite_pragmas(SQLITE_PRAGMAS))
+    event.listen(db.engine, "connect", disable_pysqlite_transactions)
+    event.listen(db.engine, "begin", begin_immediate)
 
 # Database models
 class Job(db.Model):
@@ -20,7 +126,7 @@ class Job(db.Model):
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     location = db.Column(db.String(120))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow)
 
     def to_dict(self):
         return {
@@ -28,7 +134,7 @@ class Job(db.Model):
             "title": self.title,
             "description": self.description,
             "location": self.location,
-            "created_at": self.created_at.isoformat()
+            "created_at": self.created_at
         }
 
 class Candidate(db.Model):
@@ -36,7 +142,7 @@ class Candidate(db.Model):
     name = db.Column(db.String(200), nullable=False)
     email = db.Column(db.String(200), unique=True, nullable=False)
     resume = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow)
 
     def to_dict(self):
         return {
@@ -44,7 +150,7 @@ class Candidate(db.Model):
             "name": self.name,
             "email": self.email,
             "resume": self.resume,
-            "created_at": self.created_at.isoformat()
+            "created_at": self.created_at
         }
 
 class Application(db.Model):
@@ -52,7 +158,7 @@ class Application(db.Model):
     job_id = db.Column(db.Integer, db.ForeignKey("job.id"), nullable=False)
     candidate_id = db.Column(db.Integer, db.ForeignKey("candidate.id"), nullable=False)
     cover_letter = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow)
 
     job = db.relationship("Job")
     candidate = db.relationship("Candidate")
@@ -63,9 +169,74 @@ class Application(db.Model):
             "job": self.job.to_dict() if self.job else None,
             "candidate": self.candidate.to_dict() if self.candidate else None,
             "cover_letter": self.cover_letter,
-            "created_at": self.created_at.isoformat()
+            "created_at": self.created_at
         }
 
+# Newest-first listings walk these indexes instead of sorting the whole table.
+# Candidate.email is already indexed through its UNIQUE constraint.
+db.Index("ix_job_created_at", Job.created_at.desc(), Job.id.desc())
+db.Index("ix_candidate_created_at", Candidate.created_at.desc(), Candidate.id.desc())
+db.Index("ix_application_created_at", Application.created_at.desc(), Application.id.desc())
+
+# List endpoints are keyset-paginated on (created_at, id): ?limit=N&cursor=<next
+# from the previous page>. The id breaks ties between rows created in the same
+# microsecond (e.g. rows added together by add_all), which would otherwise be
+# skipped at a page boundary.
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+INVALID_CURSOR = {"error": "cursor must be the next value of a previous page"}
+
+def page_args():
+    limit = min(max(request.args.get("limit", DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    cursor = request.args.get("cursor")
+    if not cursor:
+        return limit, None
+    created_at, row_id = cursor.rsplit("~", 1)
+    created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return limit, (created_at, int(row_id))
+
+def next_cursor(row):
+    return f"{row.created_at:%Y-%m-%dT%H:%M:%S.%f}Z~{row.id}"
+
+def paginate(query, model, limit, cursor):
+    if cursor is not None:
+        query = query.filter(tuple_(model.created_at, model.id) < cursor)
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+
+def page(rows, limit):
+    return {"items": [r.to_dict() for r in rows], "next": next_cursor(rows[-1]) if len(rows) == limit else None}
+
+# Rendered first page of /api/jobs per limit, as (jobs_version, built_at, etag,
+# body). It is rebuilt when create_job bumps the version or after JOBS_CACHE_TTL
+# seconds, which also picks up writes made by other processes. Later pages are
+# not cached.
+JOBS_CACHE_TTL = 30
+_jobs_version = 0
+_jobs_cache = {}
+
+# apply_job only needs to know the job exists and to echo it back. Jobs are never
+# edited or deleted, so recently applied-to ones are kept (as column values)
+# for a minute. TTLCache is not thread-safe, hence the lock.
+_job_cache = TTLCache(maxsize=1024, ttl=60)
+_job_cache_lock = threading.Lock()
+
+def get_job_cached(job_id):
+    with _job_cache_lock:
+        cached = _job_cache.get(job_id)
+    if cached is None:
+        job = db.session.get(Job, job_id)
+        if job is not None:
+            with _job_cache_lock:
+                _job_cache[job_id] = job.to_dict()
+        return job
+    # Attach the cached row to the session without a SELECT so relationships
+    # that point at it resolve from the identity map.
+    job = Job(**cached)
+    make_transient_to_detached(job)
+    return db.session.merge(job, load=False)
+
 # Routes
 @app.route("/")
 def root():
@@ -73,11 +244,25 @@ def root():
 
 @app.route("/api/jobs", methods=["GET"])
 def get_jobs():
-    jobs = Job.query.order_by(Job.created_at.desc()).all()
-    return jsonify([j.to_dict() for j in jobs])
+    try:
+        limit, cursor = page_args()
+    except ValueError:
+        return jsonify(INVALID_CURSOR), 400
+    if cursor is not None:
+        return jsonify(page(paginate(Job.query, Job, limit, cursor).all(), limit))
+
+    version = _jobs_version
+    cached = _jobs_cache.get(limit)
+    if cached is None or cached[0] != version or time.monotonic() - cached[1] > JOBS_CACHE_TTL:
+        body = json_dumps(page(paginate(Job.query, Job, limit, None).all(), limit))
+        cached = _jobs_cache[limit] = (version, time.monotonic(), hashlib.sha1(body).hexdigest(), body)
+    response = app.response_class(cached[3], mimetype="application/json")
+    response.set_etag(cached[2])
+    return response.make_conditional(request)
 
 @app.route("/api/jobs", methods=["POST"])
 def create_job():
+    global _jobs_version
     data = request.get_json() or {}
     title = data.get("title")
     if not title:
@@ -85,12 +270,17 @@ def create_job():
     job = Job(title=title, description=data.get("description"), location=data.get("location"))
     db.session.add(job)
     db.session.commit()
+    _jobs_version += 1
     return jsonify(job.to_dict()), 201
 
 @app.route("/api/candidates", methods=["GET"])
 def get_candidates():
-    cands = Candidate.query.order_by(Candidate.created_at.desc()).all()
-    return jsonify([c.to_dict() for c in cands])
+    try:
+        limit, cursor = page_args()
+    except ValueError:
+        return jsonify(INVALID_CURSOR), 400
+    cands = paginate(Candidate.query, Candidate, limit, cursor).all()
+    return jsonify(page(cands, limit))
 
 @app.route("/api/candidates", methods=["POST"])
 def create_candidate():
@@ -99,8 +289,8 @@ def create_candidate():
     email = data.get("email")
     if not (name and email):
         return jsonify({"error": "name and email are required"}), 400
-    existing = Candidate.query.filter_by(email=email).first()
-    if existing:
+    # Only existence matters: probe the unique email index for the id alone.
+    if db.session.query(Candidate.id).filter_by(email=email).first() is not None:
         return jsonify({"error": "candidate with this email already exists"}), 409
     cand = Candidate(name=name, email=email, resume=data.get("resume"))
     db.session.add(cand)
@@ -118,41 +308,75 @@ def apply_job():
 
     if not (name and email and job_id):
         return jsonify({"error": "name, email and job_id are required"}), 400
+    # The form posts job_id as a string; normalise it so 1 and "1" share a cache
+    # entry, without int()'s truncation of floats or acceptance of booleans.
+    if isinstance(job_id, str) and job_id.isascii() and job_id.isdigit():
+        job_id = int(job_id)
+    elif isinstance(job_id, bool) or not isinstance(job_id, int):
+        return jsonify({"error": "job_id must be an integer"}), 400
 
-    job = Job.query.get(job_id)
+    job = get_job_cached(job_id)
     if not job:
         return jsonify({"error": "job not found"}), 404
 
-    candidate = Candidate.query.filter_by(email=email).first()
-    if not candidate:
-        candidate = Candidate(name=name, email=email, resume=resume)
-        db.session.add(candidate)
-        db.session.commit()
+    # Upsert keeps the existing candidate for a known email and is race-free.
+    upsert = sqlite_insert(Candidate).values(name=name, email=email, resume=resume)
+    upsert = upsert.on_conflict_do_update(index_elements=[Candidate.email], set_={"email": upsert.excluded.email})
+    candidate = db.session.scalars(upsert.returning(Candidate)).one()
 
-    application = Application(job_id=job.id, candidate_id=candidate.id, cover_letter=cover_letter)
-    db.session.add(application)
+    application = db.session.scalars(
+        insert(Application)
+        .values(job_id=job.id, candidate_id=candidate.id, cover_letter=cover_letter)
+        .returning(Application)
+    ).one()
     db.session.commit()
     return jsonify(application.to_dict()), 201
 
 @app.route("/api/applications", methods=["GET"])
 def get_applications():
-    apps = Application.query.order_by(Application.created_at.desc()).all()
-    return jsonify([a.to_dict() for a in apps])
+    try:
+        limit, cursor = page_args()
+    except ValueError:
+        return jsonify(INVALID_CURSOR), 400
+
+    # Stream the page row by row instead of building the whole list in memory.
+    # The query is built inside the generator so it runs on the session of the
+    # context stream_with_context keeps alive, which is closed when it ends.
+    def generate():
+        apps = paginate(
+            Application.query.options(joinedload(Application.job), joinedload(Application.candidate)),
+            Application, limit, cursor,
+        ).yield_per(200)
+        yield b'{"items":['
+        count, last = 0, None
+        for last in apps:
+            yield (b"," if count else b"") + json_dumps(last.to_dict())
+            count += 1
+        yield b'],"next":' + json_dumps(next_cursor(last) if count == limit else None) + b"}"
+
+    return app.response_class(stream_with_context(generate()), mimetype="application/json")
+
+def ensure_indexes():
+    # create_all() skips tables that already exist, so add new indexes to them here.
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
 
 def seed_jobs_if_empty():
-    if Job.query.count() == 0:
+    with db.session.begin():
+        if db.session.query(Job.id).first() is not None:
+            return
         sample = [
             {"title": "Junior Backend Engineer", "description": "Work on APIs and data.", "location": "Remote"},
             {"title": "Frontend Developer", "description": "Build user-facing features.", "location": "Lagos"},
             {"title": "Data Analyst Intern", "description": "Assist with data cleaning and reports.", "location": "Onsite"}
         ]
-        for s in sample:
-            db.session.add(Job(title=s["title"], description=s["description"], location=s["location"]))
-        db.session.commit()
-        print("Seeded sample jobs.")
+        db.session.add_all([Job(**s) for s in sample])
+    print("Seeded sample jobs.")
 
 if __name__ == "__main__":
     with app.app_context():
         db.create_all()
+        ensure_indexes()
         seed_jobs_if_empty()
     app.run(host="127.0.0.1", port=5000, debug=True)
@@ -1,8 +1,14 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
+import heapq
+import orjson
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=6)
 
 # -----------------------
 # MODELS
@@ -18,45 +24,106 @@ class User(BaseModel):
     name: str
     email: str
 
+class JobPage(BaseModel):
+    items: List[Job]
+    next: Optional[int] = None
+
+class UserPage(BaseModel):
+    items: List[User]
+    next: Optional[int] = None
+
 # -----------------------
 # IN-MEMORY STORAGE (like fake database for now)
 # -----------------------
-jobs: List[Job] = []
-users: List[User] = []
+jobs: Dict[int, Job] = {}
+users: Dict[int, User] = {}
+
+# Whole-list serializers, compiled once by pydantic-core.
+list_adapters: Dict[str, TypeAdapter] = {
+    "jobs": TypeAdapter(List[Job]),
+    "users": TypeAdapter(List[User]),
+}
+
+# -----------------------
+# LIST PAGINATION + RESPONSE CACHE
+# -----------------------
+# Lists are keyset-paginated on id: ?limit=N&cursor=<next from the previous page>.
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# First pages are cached per limit, bumped on every write and served with an ETag.
+versions: Dict[str, int] = {"jobs": 0, "users": 0}
+list_cache: Dict[Tuple[str, int], Tuple[int, bytes]] = {}
+# Storage is empty after a restart, so tags from a previous process must not match.
+etag_prefix = uuid4().hex[:8]
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match may list several tags, be "*", or carry weak W/ validators.
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+def render_page(name: str, storage: Dict[int, BaseModel], limit: int, cursor: Optional[int]) -> bytes:
+    ids = heapq.nsmallest(limit, storage if cursor is None else (i for i in storage if i > cursor))
+    next_cursor = ids[-1] if len(ids) == limit else None
+    items = list_adapters[name].dump_json([storage[i] for i in ids])
+    return b'{"items":' + items + b',"next":' + orjson.dumps(next_cursor) + b"}"
+
+def list_page(request: Request, name: str, storage: Dict[int, BaseModel], limit: int, cursor: Optional[int]) -> Response:
+    if cursor is not None:
+        return Response(render_page(name, storage, limit, cursor), media_type="application/json")
+    version = versions[name]
+    etag = f'"{etag_prefix}-{name}-{version}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    cached = list_cache.get((name, limit))
+    if cached is None or cached[0] != version:
+        cached = list_cache[(name, limit)] = (version, render_page(name, storage, limit, None))
+    return Response(cached[1], media_type="application/json", headers={"ETag": etag})
 
 # -----------------------
 # JOB ROUTES
 # -----------------------
-@app.get("/jobs", response_model=List[Job])
-def get_jobs():
-    return jobs
+@app.get("/jobs", response_model=JobPage)
+async def get_jobs(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = None,
+):
+    return list_page(request, "jobs", jobs, limit, cursor)
 
 @app.post("/jobs", response_model=Job)
-def create_job(job: Job):
-    jobs.append(job)
+async def create_job(job: Job):
+    jobs[job.id] = job
+    versions["jobs"] += 1
     return job
 
 @app.get("/jobs/{job_id}", response_model=Job)
-def get_job(job_id: int):
-    for job in jobs:
-        if job.id == job_id:
-            return job
-    raise HTTPException(status_code=404, detail="Job not found")
+async def get_job(job_id: int):
+    if job_id not in jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return jobs[job_id]
 
 @app.delete("/jobs/{job_id}")
-def delete_job(job_id: int):
-    global jobs
-    jobs = [j for j in jobs if j.id != job_id]
+async def delete_job(job_id: int):
+    if jobs.pop(job_id, None) is not None:
+        versions["jobs"] += 1
     return {"message": "Job deleted"}
 
 # -----------------------
 # USER ROUTES
 # -----------------------
-@app.get("/users", response_model=List[User])
-def get_users():
-    return users
+@app.get("/users", response_model=UserPage)
+async def get_users(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = None,
+):
+    return list_page(request, "users", users, limit, cursor)
 
 @app.post("/users", response_model=User)
-def create_user(user: User):
-    users.append(user)
+async def create_user(user: User):
+    users[user.id] = user
+    versions["users"] += 1
     return user
@@ -1,9 +1,22 @@
 const API_URL = "http://127.0.0.1:5000/api";
 
+// Fetch every page of a paginated list endpoint
+async function fetchAll(path) {
+  const items = [];
+  let next = null;
+  do {
+    const cursor = next ? `&cursor=${encodeURIComponent(next)}` : "";
+    const res = await fetch(`${API_URL}${path}?limit=200${cursor}`);
+    const page = await res.json();
+    items.push(...page.items);
+    next = page.next;
+  } while (next);
+  return items;
+}
+
 // Load jobs from backend
 async function loadJobs() {
-  const res = await fetch(`${API_URL}/jobs`);
-  const jobs = await res.json();
+  const jobs = await fetchAll("/jobs");
   const jobsList = document.getElementById("jobs-list");
   const jobSelect = document.getElementById("job-select");
   jobsList.innerHTML = "";
@@ -46,8 +59,7 @@ document.getElementById("application-form").addEventListener("submit", async (e)
 
 // Load applications
 async function loadApplications() {
-  const res = await fetch(`${API_URL}/applications`);
-  const apps = await res.json();
+  const apps = await fetchAll("/applications");
   const list = document.getElementById("applications-list");
   list.innerHTML = "";
   apps.forEach(app => {